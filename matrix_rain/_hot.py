@@ -0,0 +1,189 @@
+"""
+Per-frame kernels for the column state and screen rendering.
+
+Free functions over flat arrays and an explicit slot list: no per-column
+objects or attribute lookups inside the loops, and every local has a
+single static type. Kept in their own module so the hot path can be
+compiled ahead of time without touching the rest of the package; the
+plain Python source is the fallback when no compiled build is present.
+"""
+
+import bisect
+import itertools
+from array import array
+from typing import Iterable
+
+from . import config
+
+
+def update_positions(ys: array, speeds: array, slots: list[int], delta_time: float) -> None:
+    """
+    Advance the head position of each column by speed × time.
+
+    Args:
+        ys: Head row positions, updated in place
+        speeds: Speeds in rows per second
+        slots: Slot indices of live columns
+        delta_time: Time elapsed since last update (in seconds)
+    """
+    for slot in slots:
+        ys[slot] += speeds[slot] * delta_time
+
+
+def mutate_trail(trail_chars: array, trail_mutating: bytearray, samples: array) -> None:
+    """
+    Replace every mutating trail character with the next random sample.
+
+    The mutating flags act as a mask over the whole flat trail array, so
+    only mutating cells are visited and the scan itself runs in C.
+
+    Args:
+        trail_chars: Flat (slot x max_len) trail pool indices, updated in place
+        trail_mutating: Flat (slot x max_len) mutating flags (0 for dead slots)
+        samples: Random pool indices, one per mutating cell
+    """
+    for i, index in zip(itertools.compress(range(len(trail_mutating)), trail_mutating), samples):
+        trail_chars[i] = index
+
+
+def render_trails(
+    ys: array, xs: array, lengths: array, trail_chars: array, highlight_pos: array,
+    slots: list[int], max_len: int, glyph_ids: tuple[int, ...],
+    chars: array, colors: array, row_dirty: bytearray, width: int, terminal_height: int
+) -> None:
+    """
+    Write the on-screen trail cells of each column straight into screen buffers.
+
+    Args:
+        ys: Head row positions
+        xs: Column positions
+        lengths: Trail length of each column
+        trail_chars: Flat (slot x max_len) trail pool indices
+        highlight_pos: Trail index of the highlighted glyph (-1 if none)
+        slots: Slot indices of live columns
+        max_len: Row stride of the flat trail arrays
+        glyph_ids: Glyph id (config.GLYPH_SET index) for each pool index
+        chars: Flat (row x width) screen glyph ids, updated in place
+        colors: Flat (row x width) screen color ids, updated in place
+        row_dirty: Per-row damage flags, set for every row written
+        width: Row stride of the screen buffers
+        terminal_height: Height of terminal
+    """
+    # Color tables for the active color mode (see config.specialize_color);
+    # trail positions never exceed MAX_TRAIL_LENGTH so no clamping is needed
+    trail_color_ids = config.trail_color_ids
+    highlight_color_ids = config.highlight_color_ids
+
+    for slot in slots:
+        head_y = int(ys[slot])
+        highlight = highlight_pos[slot]
+        base = slot * max_len
+
+        # Only visit trail indices that land on screen
+        # (0 <= head_y - i < terminal_height), so no per-cell bounds test
+        i_start = max(0, head_y - terminal_height + 1)
+        i_end = min(lengths[slot], head_y + 1)
+
+        # Trail index i sits one row (one stride) above index i - 1
+        cell = (head_y - i_start) * width + xs[slot]
+        for i in range(i_start, i_end):
+            chars[cell] = glyph_ids[trail_chars[base + i]]
+            colors[cell] = highlight_color_ids[i] if i == highlight else trail_color_ids[i]
+            row_dirty[head_y - i] = 1
+            cell -= width
+
+
+def assemble_frame(
+    chars: array, colors: array, prev_chars: array, prev_colors: array,
+    row_dirty: bytearray, width: int, cursor_moves: list[bytes], dirty_tracking: bool,
+    out: bytearray
+) -> None:
+    """
+    Append the ANSI output that brings the terminal from the previous frame to this one.
+
+    Research: "Update only changed positions" for efficiency.
+
+    Args:
+        chars: Flat (row x width) glyph ids (indices into config.GLYPH_SET)
+        colors: Flat (row x width) color ids (indices into config.COLOR_TABLE)
+        prev_chars: Glyph ids last written, updated in place
+        prev_colors: Color ids last written, updated in place
+        row_dirty: Per-row damage flags; only flagged rows are visited
+            when dirty tracking is on
+        width: Row stride of the screen buffers
+        cursor_moves: Encoded cursor-position escape for every cell
+        dirty_tracking: If False, every cell is written
+        out: Receives the encoded escapes and glyphs
+    """
+    glyph_bytes = config.GLYPH_BYTES
+    color_bytes = config.COLOR_PALETTE_BYTES
+    current_color = 0  # Track current color id to avoid redundant resets
+
+    # Rows not written since the last frame still match prev and are not
+    # visited at all
+    height = len(row_dirty)
+    rows: Iterable[int] = (
+        itertools.compress(range(height), row_dirty) if dirty_tracking else range(height)
+    )
+
+    for row in rows:
+        start = row * width
+        end = start + width
+
+        # Skip rows that were written but came out unchanged, with one
+        # C-level comparison per array instead of comparing every cell
+        row_chars = chars[start:end]
+        row_colors = colors[start:end]
+        if (dirty_tracking and row_chars == prev_chars[start:end]
+                and row_colors == prev_colors[start:end]):
+            continue
+
+        # Gather the row's dirty cells as runs of adjacent cells; each run
+        # is written after a single cursor move
+        runs: list[tuple[int, int, int]] = []  # (first color, start, end)
+        run_start = run_end = -1
+        for cell in range(start, end):
+            # Only update if changed (dirty tracking)
+            if dirty_tracking and chars[cell] == prev_chars[cell] and colors[cell] == prev_colors[cell]:
+                continue
+            if cell != run_end:
+                if run_start >= 0:
+                    runs.append((colors[run_start], run_start, run_end))
+                run_start = cell
+            run_end = cell + 1
+        if run_start >= 0:
+            runs.append((colors[run_start], run_start, run_end))
+
+        # Runs are independent, so write them grouped by color instead of
+        # left to right, starting with the color already active: same-color
+        # runs then share one color escape instead of switching per run
+        if len(runs) > 1:
+            runs.sort()
+            first = bisect.bisect_left(runs, (current_color,))
+            if first:
+                runs = runs[first:] + runs[:first]
+
+        for _, run_start, run_end in runs:
+            out += cursor_moves[run_start]
+            for cell in range(run_start, run_end):
+                # Only change color if different from current (uint8 ids)
+                color = colors[cell]
+                if color != current_color:
+                    if color:
+                        out += color_bytes[color]
+                    else:
+                        # Need to reset to default
+                        out += config.ANSI_RESET
+                    current_color = color
+
+                # Write character (advances the cursor one cell)
+                out += glyph_bytes[chars[cell]]
+
+        # Snapshot the row for next frame's dirty tracking: an in-place
+        # memcpy into the existing array, only for rows that changed
+        prev_chars[start:end] = row_chars
+        prev_colors[start:end] = row_colors
+
+    # Reset color at end if needed
+    if current_color:
+        out += config.ANSI_RESET
@@ -5,6 +5,7 @@ Handles random character selection from the research-identified character pool.
 """
 
 import random
+from array import array
 from typing import Final
 
 from . import config
@@ -17,10 +18,16 @@ class CharacterPool:
     Research findings: "Half-width katakana characters combined with
     Latin letters and numerals" from the 1999 Matrix film.
 
+    Characters are handled as uint8 indices into `pool` (the pool is far
+    smaller than 256 glyphs), with `pool_glyph_ids` mapping each to its id
+    in config.GLYPH_SET. Bulk requests are served from a ring buffer of pre-sampled
+    indices, so generating a trail costs one array slice instead of one RNG
+    call per character.
+
     Using __slots__ to reduce memory overhead.
     """
 
-    __slots__ = ('use_unicode', 'pool')
+    __slots__ = ('use_unicode', 'pool', 'pool_glyph_ids', 'ring', 'cursor')
 
     def __init__(self, use_unicode: bool = True):
         """
@@ -33,6 +40,13 @@ class CharacterPool:
         # Optimized: Convert string to tuple for faster random.choice()
         pool_str = config.CHARACTER_POOL if use_unicode else config.ASCII_POOL
         self.pool = tuple(pool_str)
+        self.pool_glyph_ids = tuple(map(config.GLYPH_IDS.__getitem__, pool_str))
+        self.refill_ring()
+
+    def refill_ring(self) -> None:
+        """Re-sample the ring buffer and rewind its cursor."""
+        self.ring = array('B', random.choices(range(len(self.pool)), k=config.RANDOM_RING_SIZE))
+        self.cursor = 0
 
     def get_random_char(self) -> str:
         """
@@ -45,6 +59,26 @@ class CharacterPool:
         """
         return random.choice(self.pool)
 
+    def take_indices(self, count: int) -> array:
+        """
+        Take the next `count` random pool indices from the ring buffer.
+
+        The ring is re-sampled when it cannot serve the request.
+
+        Args:
+            count: Number of indices to take
+
+        Returns:
+            uint8 array of random pool indices
+        """
+        if count > len(self.ring):
+            return array('B', random.choices(range(len(self.pool)), k=count))
+        if self.cursor + count > len(self.ring):
+            self.refill_ring()
+        start = self.cursor
+        self.cursor += count
+        return self.ring[start:self.cursor]
+
     def get_random_sequence(self, length: int) -> list[str]:
         """
         Generate a sequence of random characters.
@@ -55,8 +89,7 @@ class CharacterPool:
         Returns:
             List of random characters
         """
-        # Optimized: Use random.choices() for better performance
-        return random.choices(self.pool, k=length)
+        return list(map(self.pool.__getitem__, self.take_indices(length)))
 
 
 # Global character pool instance
@@ -105,3 +138,36 @@ def get_random_sequence(length: int) -> list[str]:
     if _pool is None:
         raise RuntimeError("Character pool not initialized. Call initialize_pool() first.")
     return _pool.get_random_sequence(length)
+
+
+def take_indices(count: int) -> array:
+    """
+    Take random pool indices in bulk from the global pool's ring buffer.
+
+    Args:
+        count: Number of indices to take
+
+    Returns:
+        uint8 array of random pool indices
+
+    Raises:
+        RuntimeError: If pool not initialized
+    """
+    if _pool is None:
+        raise RuntimeError("Character pool not initialized. Call initialize_pool() first.")
+    return _pool.take_indices(count)
+
+
+def get_pool_glyph_ids() -> tuple[int, ...]:
+    """
+    Get the config.GLYPH_SET id of each glyph of the global pool, indexed by pool index.
+
+    Returns:
+        Tuple of glyph ids
+
+    Raises:
+        RuntimeError: If pool not initialized
+    """
+    if _pool is None:
+        raise RuntimeError("Character pool not initialized. Call initialize_pool() first.")
+    return _pool.pool_glyph_ids
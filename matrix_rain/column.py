@@ -1,42 +1,53 @@
 """
-Column class representing a single falling rain column.
+Column state for the falling rain columns.
 
-Each column maintains its state including position, speed, trail characters,
-and mutation behavior.
+Columns are stored struct-of-arrays style: each column occupies one slot
+(row index) across parallel arrays holding its position, speed, trail
+characters, and mutation behavior.
 """
 
+import bisect
 import itertools
+import math
 import random
-from dataclasses import dataclass
-from typing import Final
+import sys
+from array import array
+from typing import Final, Iterator
 
+from . import _hot
 from . import characters
 from . import config
 
 
-@dataclass(slots=True)
-class CharacterCell:
-    """
-    A single character cell in a column trail.
+# log(1 - p) for the geometric gap; only defined for 0 < p < 1, the
+# endpoints are handled directly by spawn_gap()
+_LOG_NO_SPAWN_PROBABILITY: Final[float] = (
+    math.log(1.0 - config.SPAWN_PROBABILITY) if 0.0 < config.SPAWN_PROBABILITY < 1.0 else 0.0
+)
 
-    Research: "Some strings consist entirely of changing glyphs while
-    others have static characters"
 
-    Using __slots__ to reduce memory overhead (important for many instances).
+def spawn_gap() -> int:
     """
+    Sample how many x positions to skip before the next spawn.
 
-    char: str
-    is_mutating: bool  # Whether this character changes every 3 frames
+    Spawns are independent per x with SPAWN_PROBABILITY, so the gap between
+    spawning positions is geometric. Jumping from spawn to spawn draws one
+    random number per spawn instead of one per x position.
 
-    def mutate(self) -> None:
-        """Change this character to a new random one."""
-        if self.is_mutating:
-            self.char = characters.get_random_char()
+    Returns:
+        Number of non-spawning positions before the next spawning one
+        (0 if every position spawns, sys.maxsize if none does)
+    """
+    if config.SPAWN_PROBABILITY >= 1.0:
+        return 0
+    if config.SPAWN_PROBABILITY <= 0.0:
+        return sys.maxsize
+    return int(math.log(1.0 - random.random()) / _LOG_NO_SPAWN_PROBABILITY)
 
 
-class Column:
+class ColumnState:
     """
-    Represents a single falling rain column.
+    Struct-of-arrays storage for all falling rain columns.
 
     Research findings:
     - Columns fall at variable speeds (5-20 rows/second, time-based)
@@ -44,125 +55,227 @@ class Column:
     - 20% of columns have highlighted runner glyphs
     - Characters mutate every 3 frames (synchronized globally)
 
+    A column is a slot index into the parallel arrays rather than an object,
+    so a frame's update is one sweep over flat memory instead of thousands
+    of attribute lookups. Trail characters are uint8 pool indices in a flat
+    (capacity x MAX_TRAIL_LENGTH) array, head first. Dead slots go back on
+    a free-slot stack for reuse.
+
     Using __slots__ to reduce memory overhead.
     """
 
-    __slots__ = ('x', 'terminal_height', 'speed', 'length', 'y', 'trail',
-                 'is_highlighted', 'highlight_position')
+    __slots__ = ('capacity', 'xs', 'ys', 'speeds', 'lengths', 'highlight_pos',
+                 'alive_mask', 'trail_chars', 'trail_mutating', 'free_slots',
+                 '_sorted')
 
-    def __init__(self, x: int, terminal_height: int):
+    def __init__(self, capacity: int):
         """
-        Initialize a new column.
+        Initialize empty column storage.
 
         Args:
-            x: Horizontal position (column number)
-            terminal_height: Height of terminal (for lifecycle management)
+            capacity: Number of column slots to preallocate
         """
-        self.x = x
-        self.terminal_height = terminal_height
+        self.capacity = 0
+        self.xs = array('i')
+        self.ys = array('d')
+        self.speeds = array('d')
+        self.lengths = array('i')
+        # Trail index of the highlighted runner glyph, -1 if none
+        self.highlight_pos = array('i')
+        self.alive_mask = bytearray()
+        self.trail_chars = array('B')
+        self.trail_mutating = bytearray()
+        self.free_slots: list[int] = []
+        # Live slots ordered by x, maintained on spawn and release
+        self._sorted: list[int] = []
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        """
+        Extend storage to hold at least `capacity` columns.
+
+        Args:
+            capacity: Required number of column slots
+        """
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+
+        self.xs.extend(itertools.repeat(0, extra))
+        self.ys.extend(itertools.repeat(0.0, extra))
+        self.speeds.extend(itertools.repeat(0.0, extra))
+        self.lengths.extend(itertools.repeat(0, extra))
+        self.highlight_pos.extend(itertools.repeat(-1, extra))
+        self.alive_mask.extend(bytes(extra))
+        self.trail_chars.extend(itertools.repeat(0, extra * config.MAX_TRAIL_LENGTH))
+        self.trail_mutating.extend(bytes(extra * config.MAX_TRAIL_LENGTH))
+
+        # Free list is a stack: keep lowest slots on top so they are reused first
+        self.free_slots[:0] = range(capacity - 1, self.capacity - 1, -1)
+        self.capacity = capacity
+
+    def active_slots(self) -> Iterator[int]:
+        """
+        Iterate over the slots of all live columns.
+
+        Returns:
+            Iterator of slot indices
+        """
+        return itertools.compress(range(self.capacity), self.alive_mask)
 
-        # Random speed from research parameters
-        self.speed = random.uniform(config.MIN_SPEED, config.MAX_SPEED)
+    def sorted_slots(self) -> list[int]:
+        """
+        Get the slots of all live columns ordered by x position.
 
-        # Random trail length from research parameters
-        self.length = random.randint(config.MIN_TRAIL_LENGTH, config.MAX_TRAIL_LENGTH)
+        Sweeping columns left to right keeps reads of the column arrays and
+        writes to the screen buffer close together. The list is updated
+        incrementally on spawn and release, so only occupied slots are ever
+        visited; empty x positions and free slots cost nothing.
 
-        # Position tracking (can start above screen)
-        # Research: "Invisible characters precede visible glyphs"
-        self.y = random.uniform(-self.length, 0)  # Start position (can be negative)
+        Returns:
+            Slot indices sorted by x (ties in spawn order)
+        """
+        return self._sorted
 
-        # Initialize trail characters
+    def spawn_batch(self, xs: list[int]) -> list[int]:
+        """
+        Initialize new columns in free slots, one per x position.
+
+        All random attributes for the batch are drawn together and the
+        trail characters come from a single ring-buffer slice, instead of a
+        separate round of sampling per column.
+
+        Args:
+            xs: Horizontal positions (column numbers) of the new columns
+
+        Returns:
+            Slot indices of the new columns
+
+        Raises:
+            IndexError: If not enough free slots are available
+        """
+        count = len(xs)
+        rand = random.random
+        slots = [self.free_slots.pop() for _ in range(count)]
+
+        # Random speed and trail length from research parameters
+        speeds = [random.uniform(config.MIN_SPEED, config.MAX_SPEED) for _ in range(count)]
+        lengths = [
+            random.randint(config.MIN_TRAIL_LENGTH, config.MAX_TRAIL_LENGTH)
+            for _ in range(count)
+        ]
+
+        # Trail characters for the whole batch
         # Research: "40-60% of character positions as mutating"
-        self.trail: list[CharacterCell] = []
-        for _ in range(self.length):
-            char = characters.get_random_char()
-            is_mutating = random.random() < config.MUTATING_CHAR_PROBABILITY
-            self.trail.append(CharacterCell(char, is_mutating))
+        total = sum(lengths)
+        chars = characters.take_indices(total)
+        mutating = bytes(rand() < config.MUTATING_CHAR_PROBABILITY for _ in range(total))
 
-        # Highlighted runner glyph support
         # Research: "1 in 5 strings (20%) feature a highlighted glyph"
-        self.is_highlighted = random.random() < config.HIGHLIGHTED_COLUMN_PROBABILITY
-        if self.is_highlighted:
+        highlighted = [rand() < config.HIGHLIGHTED_COLUMN_PROBABILITY for _ in range(count)]
+
+        max_len = config.MAX_TRAIL_LENGTH
+        offset = 0
+        for slot, x, speed, length, is_highlighted in zip(slots, xs, speeds, lengths, highlighted):
+            self.xs[slot] = x
+            self.speeds[slot] = speed
+            self.lengths[slot] = length
+
+            # Position tracking (can start above screen)
+            # Research: "Invisible characters precede visible glyphs"
+            self.ys[slot] = -rand() * length
+
+            base = slot * max_len
+            self.trail_chars[base:base + length] = chars[offset:offset + length]
+            self.trail_mutating[base:base + length] = mutating[offset:offset + length]
+            offset += length
+
             # Highlight position in middle third of trail (not head)
-            self.highlight_position = random.randint(self.length // 3, 2 * self.length // 3)
-        else:
-            self.highlight_position = -1
+            if is_highlighted:
+                self.highlight_pos[slot] = random.randint(length // 3, 2 * length // 3)
+            else:
+                self.highlight_pos[slot] = -1
 
-    def update(self, delta_time: float) -> None:
+            self.alive_mask[slot] = 1
+            bisect.insort(self._sorted, slot, key=self.xs.__getitem__)
+
+        return slots
+
+    def release(self, slot: int) -> None:
         """
-        Update column position based on elapsed time.
+        Return a column's slot to the free list.
 
         Args:
-            delta_time: Time elapsed since last update (in seconds)
+            slot: Slot index of the column
         """
-        # Move down by speed (rows per second) × time elapsed
-        # This ensures consistent speed regardless of actual FPS
-        self.y += self.speed * delta_time
+        self.alive_mask[slot] = 0
+        self.free_slots.append(slot)
+        self._sorted.remove(slot)
 
-    def mutate_characters(self) -> None:
+        # Clear mutating flags so they stay an exact count of live mutating cells
+        base = slot * config.MAX_TRAIL_LENGTH
+        self.trail_mutating[base:base + config.MAX_TRAIL_LENGTH] = bytes(config.MAX_TRAIL_LENGTH)
+
+    def update(self, delta_time: float) -> None:
         """
-        Mutate all mutating characters in the trail.
+        Advance every live column based on elapsed time.
 
-        Research: "All changing glyphs change on the same frame"
-        Called globally every 3 frames.
+        Args:
+            delta_time: Time elapsed since last update (in seconds)
         """
-        for cell in self.trail:
-            cell.mutate()
+        # Move down by speed (rows per second) × time elapsed
+        # This ensures consistent speed regardless of actual FPS
+        _hot.update_positions(self.ys, self.speeds, self.sorted_slots(), delta_time)
 
-    def is_alive(self) -> bool:
+    def dead_slots(self, terminal_height: int) -> list[int]:
         """
-        Check if column should still be rendered.
+        Find live columns that have fallen completely off screen.
 
         Research: "Columns disappear when their length exceeds
         approximately 2x screen height"
 
+        Args:
+            terminal_height: Height of terminal
+
         Returns:
-            True if column is still visible or will be visible
+            Slot indices of columns whose tail has passed off screen
         """
-        # Column is dead when its tail has passed off screen
-        tail_y = self.y - self.length
-        return tail_y < self.terminal_height
+        ys = self.ys
+        lengths = self.lengths
+        return [
+            slot for slot in self.sorted_slots()
+            if ys[slot] - lengths[slot] >= terminal_height
+        ]
 
-    def get_visible_characters(self) -> list[tuple[int, str, bool]]:
+    def mutate_characters(self) -> None:
         """
-        Get list of visible characters with their screen positions.
+        Mutate all mutating characters of every live column.
 
-        Returns:
-            List of (row, character, is_highlighted) tuples for visible chars
+        Research: "All changing glyphs change on the same frame"
         """
-        visible = []
-        head_y = int(self.y)
-
-        for i, cell in enumerate(self.trail):
-            char_y = head_y - i
-
-            # Only include if on screen
-            if 0 <= char_y < self.terminal_height:
-                is_highlighted = (self.is_highlighted and i == self.highlight_position)
-                visible.append((char_y, cell.char, is_highlighted))
-
-        return visible
-
-    def get_render_data(self) -> list[tuple[int, int, str, int, bool]]:
+        # One bulk sample per mutation instead of one RNG call per cell
+        samples = characters.take_indices(self.trail_mutating.count(1))
+        _hot.mutate_trail(self.trail_chars, self.trail_mutating, samples)
+
+    def render_into(
+        self, chars: array, colors: array, row_dirty: bytearray,
+        terminal_width: int, terminal_height: int
+    ) -> None:
         """
-        Get complete rendering data for this column.
+        Draw every live column directly into screen buffers.
 
-        Returns:
-            List of (row, col, char, trail_position, is_highlighted) tuples
-            where trail_position is distance from head (0 = head)
+        Args:
+            chars: Flat (row x width) screen glyph ids, updated in place
+            colors: Flat (row x width) screen color ids, updated in place
+            row_dirty: Per-row damage flags, set for every row drawn
+            terminal_width: Width of terminal (row stride of the buffers)
+            terminal_height: Height of terminal
         """
-        render_data = []
-        head_y = int(self.y)
-
-        for i, cell in enumerate(self.trail):
-            char_y = head_y - i
-
-            # Only include if on screen
-            if 0 <= char_y < self.terminal_height:
-                is_highlighted = (self.is_highlighted and i == self.highlight_position)
-                render_data.append((char_y, self.x, cell.char, i, is_highlighted))
-
-        return render_data
+        _hot.render_trails(
+            self.ys, self.xs, self.lengths, self.trail_chars, self.highlight_pos,
+            self.sorted_slots(), config.MAX_TRAIL_LENGTH, characters.get_pool_glyph_ids(),
+            chars, colors, row_dirty, terminal_width, terminal_height,
+        )
 
 
 class ColumnManager:
@@ -174,7 +287,7 @@ class ColumnManager:
     Using __slots__ to reduce memory overhead.
     """
 
-    __slots__ = ('terminal_width', 'terminal_height', 'columns', 'frame_count')
+    __slots__ = ('terminal_width', 'terminal_height', 'state', 'count_per_x', 'frame_count')
 
     def __init__(self, terminal_width: int, terminal_height: int):
         """
@@ -186,7 +299,9 @@ class ColumnManager:
         """
         self.terminal_width = terminal_width
         self.terminal_height = terminal_height
-        self.columns: dict[int, list[Column]] = {x: [] for x in range(terminal_width)}
+        self.state = ColumnState(terminal_width * config.MAX_COLUMNS_PER_X)
+        # Number of live columns at each x position
+        self.count_per_x = bytearray(terminal_width)
         self.frame_count = 0
 
     def update(self, delta_time: float) -> None:
@@ -197,20 +312,28 @@ class ColumnManager:
             delta_time: Time since last frame
         """
         self.frame_count += 1
+        state = self.state
 
         # Update existing columns
-        for x in range(self.terminal_width):
-            # Update each column in this x position
-            for column in self.columns[x]:
-                column.update(delta_time)
-
-            # Remove dead columns
-            self.columns[x] = [col for col in self.columns[x] if col.is_alive()]
-
-            # Spawn new columns based on probability
-            # Research: "~2.5% chance per frame"
-            if random.random() < config.SPAWN_PROBABILITY:
-                self.spawn_column(x)
+        state.update(delta_time)
+
+        # Remove dead columns
+        for slot in state.dead_slots(self.terminal_height):
+            self.count_per_x[state.xs[slot]] -= 1
+            state.release(slot)
+
+        # Spawn new columns based on probability
+        # Research: "~2.5% chance per frame"
+        count_per_x = self.count_per_x
+        spawn_xs = []
+        x = spawn_gap()
+        while x < self.terminal_width:
+            if count_per_x[x] < config.MAX_COLUMNS_PER_X:
+                spawn_xs.append(x)
+                count_per_x[x] += 1
+            x += 1 + spawn_gap()
+        if spawn_xs:
+            state.spawn_batch(spawn_xs)
 
         # Global character mutation every 3 frames
         # Research: "Glyphs remain static for exactly 3 frames, then change"
@@ -224,11 +347,9 @@ class ColumnManager:
         Args:
             x: Horizontal position
         """
-        # Research allows multiple raindrops per column
-        # Limit to 2-3 to avoid excessive density
-        if len(self.columns[x]) < 3:
-            column = Column(x, self.terminal_height)
-            self.columns[x].append(column)
+        if self.count_per_x[x] < config.MAX_COLUMNS_PER_X:
+            self.state.spawn_batch([x])
+            self.count_per_x[x] += 1
 
     def mutate_all_characters(self) -> None:
         """
@@ -236,23 +357,23 @@ class ColumnManager:
 
         Research: "All changing glyphs change on the same frame"
         """
-        for x in range(self.terminal_width):
-            for column in self.columns[x]:
-                column.mutate_characters()
+        self.state.mutate_characters()
 
-    def get_all_render_data(self) -> list[tuple[int, int, str, int, bool]]:
+    def render_into(self, chars: array, colors: array, row_dirty: bytearray) -> None:
         """
-        Get rendering data for all columns.
+        Draw all columns directly into screen buffers.
 
-        Returns:
-            List of (row, col, char, trail_position, is_highlighted) tuples
+        Single pass over the column state with no intermediate render list.
+        Colors come from the tables selected by config.specialize_color().
+
+        Args:
+            chars: Flat (row x width) screen glyph ids, updated in place
+            colors: Flat (row x width) screen color ids, updated in place
+            row_dirty: Per-row damage flags, set for every row drawn
         """
-        # Optimized: Use itertools.chain to flatten without intermediate lists
-        return list(itertools.chain.from_iterable(
-            column.get_render_data()
-            for x in range(self.terminal_width)
-            for column in self.columns[x]
-        ))
+        self.state.render_into(
+            chars, colors, row_dirty, self.terminal_width, self.terminal_height
+        )
 
     def resize(self, new_width: int, new_height: int) -> None:
         """
@@ -266,18 +387,14 @@ class ColumnManager:
         self.terminal_width = new_width
         self.terminal_height = new_height
 
-        # Adjust columns dict
         if new_width > old_width:
-            # Add new columns
-            for x in range(old_width, new_width):
-                self.columns[x] = []
+            # Add room for the new x positions
+            self.state.grow(new_width * config.MAX_COLUMNS_PER_X)
+            self.count_per_x.extend(bytes(new_width - old_width))
         elif new_width < old_width:
-            # Remove excess columns
-            for x in range(new_width, old_width):
-                if x in self.columns:
-                    del self.columns[x]
-
-        # Update terminal height for existing columns
-        for x in range(min(new_width, old_width)):
-            for column in self.columns[x]:
-                column.terminal_height = new_height
+            # Remove columns beyond the new width
+            state = self.state
+            for slot in list(state.active_slots()):
+                if state.xs[slot] >= new_width:
+                    state.release(slot)
+            del self.count_per_x[new_width:]
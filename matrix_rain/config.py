@@ -22,10 +22,27 @@ CHARACTER_POOL: Final[str] = KATAKANA_CHARS + NUMERAL_CHARS
 # Alternative ASCII-only pool for terminals without Unicode support
 ASCII_POOL: Final[str] = NUMERAL_CHARS + LATIN_CHARS + SYMBOL_CHARS
 
+# Glyph table: every glyph either pool can draw, indexed by a small glyph id
+# Screen buffers store ids as uint8; id 0 is the blank cell
+GLYPH_SET: Final[tuple[str, ...]] = (" ",) + tuple(dict.fromkeys(CHARACTER_POOL + ASCII_POOL))
+GLYPH_IDS: Final[dict[str, int]] = {glyph: i for i, glyph in enumerate(GLYPH_SET)}
+# Each glyph UTF-8 encoded once, for byte-level output
+GLYPH_BYTES: Final[tuple[bytes, ...]] = tuple(glyph.encode("utf-8") for glyph in GLYPH_SET)
+
+# Number of pre-sampled random characters kept in the pool's ring buffer
+# Bulk sampling once per refill replaces one random.choice() call per glyph
+RANDOM_RING_SIZE: Final[int] = 1 << 16
+
 # Frame Rate and Timing
 # Research: "Target 20fps refresh rate" "50ms delay between frames"
 TARGET_FPS: Final[int] = 20
 FRAME_DELAY: Final[float] = 1.0 / TARGET_FPS  # 0.05 seconds = 50ms
+FRAME_DELAY_NS: Final[int] = 1_000_000_000 // TARGET_FPS  # Frame period in nanoseconds
+
+# Keyboard Polling
+# The quit key is watched on a background thread; this is how long it
+# waits on stdin before re-checking whether the app is shutting down
+INPUT_POLL_TIMEOUT: Final[float] = 0.1
 
 # Character Mutation Timing
 # Research: "Glyphs remain static for exactly 3 frames, then change"
@@ -51,6 +68,11 @@ MAX_SPEED: Final[float] = 20.0  # rows per second (fast columns)
 MIN_TRAIL_LENGTH: Final[int] = 7
 MAX_TRAIL_LENGTH: Final[int] = 20
 
+# Column Density
+# Research allows multiple raindrops per column; limit to 2-3 to avoid
+# excessive density
+MAX_COLUMNS_PER_X: Final[int] = 3
+
 # Highlighted Runner Glyphs
 # Research: "Approximately 1 in 5 strings (20%) feature a highlighted glyph"
 HIGHLIGHTED_COLUMN_PROBABILITY: Final[float] = 0.2  # 20% chance
@@ -74,19 +96,20 @@ COLOR_256_DIM_GREEN: Final[int] = 22  # Dim green
 
 # 16-color mode ANSI codes (fallback)
 # Research: "bright white for head, then bright green to normal green to dim green"
-ANSI_RESET: Final[str] = "\033[0m"
+ANSI_RESET: Final[bytes] = b"\033[0m"
 ANSI_BRIGHT_WHITE: Final[str] = "\033[97m"
 ANSI_BRIGHT_GREEN: Final[str] = "\033[92m"
 ANSI_GREEN: Final[str] = "\033[32m"
 ANSI_DIM_GREEN: Final[str] = "\033[2;32m"
 
 # ANSI Terminal Control Codes
-ANSI_HIDE_CURSOR: Final[str] = "\033[?25l"
-ANSI_SHOW_CURSOR: Final[str] = "\033[?25h"
-ANSI_CLEAR_SCREEN: Final[str] = "\033[2J"
-ANSI_HOME: Final[str] = "\033[H"
-ANSI_ALTERNATE_BUFFER: Final[str] = "\033[?1049h"  # Enter alternate screen
-ANSI_NORMAL_BUFFER: Final[str] = "\033[?1049l"  # Exit alternate screen
+# Stored as bytes: the renderer writes them straight to stdout's binary buffer
+ANSI_HIDE_CURSOR: Final[bytes] = b"\033[?25l"
+ANSI_SHOW_CURSOR: Final[bytes] = b"\033[?25h"
+ANSI_CLEAR_SCREEN: Final[bytes] = b"\033[2J"
+ANSI_HOME: Final[bytes] = b"\033[H"
+ANSI_ALTERNATE_BUFFER: Final[bytes] = b"\033[?1049h"  # Enter alternate screen
+ANSI_NORMAL_BUFFER: Final[bytes] = b"\033[?1049l"  # Exit alternate screen
 
 # Color gradient steps for trail
 # Maps trail position to color (0 = head, higher = further down trail)
@@ -117,6 +140,90 @@ MIN_TERMINAL_WIDTH: Final[int] = 40
 MIN_TERMINAL_HEIGHT: Final[int] = 20
 
 
+def _gradient_index_256(position: int) -> int:
+    """Map a trail position to its COLOR_GRADIENT_256 index."""
+    if position == 0:
+        return 0
+    elif position == 1:
+        return 1
+    elif position <= 3:
+        return 2
+    elif position <= 6:
+        return 3
+    elif position <= 10:
+        return 4
+    else:
+        return 5
+
+
+def _gradient_index_16(position: int) -> int:
+    """Map a trail position to its COLOR_GRADIENT_16 index."""
+    if position == 0:
+        return 0
+    elif position <= 2:
+        return 1
+    elif position <= 6:
+        return 2
+    else:
+        return 3
+
+
+# Color lookup tables indexed by trail position (clamped to the last entry)
+# Precomputed once so the render loop does one index instead of a branch
+# ladder plus an f-string per glyph
+COLOR_LUT_256: Final[tuple[str, ...]] = tuple(
+    f"\033[38;5;{COLOR_GRADIENT_256[_gradient_index_256(p)]}m"
+    for p in range(MAX_TRAIL_LENGTH)
+)
+COLOR_LUT_16: Final[tuple[str, ...]] = tuple(
+    COLOR_GRADIENT_16[_gradient_index_16(p)] for p in range(MAX_TRAIL_LENGTH)
+)
+
+# Highlighted runner glyphs are one level brighter than normal trail
+# (three positions closer to the head)
+COLOR_LUT_HL_256: Final[tuple[str, ...]] = tuple(
+    COLOR_LUT_256[max(0, p - 3)] for p in range(MAX_TRAIL_LENGTH)
+)
+COLOR_LUT_HL_16: Final[tuple[str, ...]] = tuple(
+    COLOR_LUT_16[max(0, p - 3)] for p in range(MAX_TRAIL_LENGTH)
+)
+
+
+# Color table: every distinct color escape, indexed by a small color id
+# Screen buffers store ids as uint8, so the palette holds at most 256
+# colors; id 0 is the terminal default (no color)
+COLOR_TABLE: Final[tuple[str, ...]] = ("",) + tuple(dict.fromkeys(COLOR_LUT_256 + COLOR_LUT_16))
+COLOR_IDS: Final[dict[str, int]] = {code: i for i, code in enumerate(COLOR_TABLE)}
+# The same palette UTF-8 encoded once, for byte-level output
+COLOR_PALETTE_BYTES: Final[tuple[bytes, ...]] = tuple(code.encode() for code in COLOR_TABLE)
+
+# Color id lookup tables indexed by trail position
+COLOR_ID_LUT_256: Final[tuple[int, ...]] = tuple(COLOR_IDS[c] for c in COLOR_LUT_256)
+COLOR_ID_LUT_16: Final[tuple[int, ...]] = tuple(COLOR_IDS[c] for c in COLOR_LUT_16)
+COLOR_ID_LUT_HL_256: Final[tuple[int, ...]] = tuple(COLOR_IDS[c] for c in COLOR_LUT_HL_256)
+COLOR_ID_LUT_HL_16: Final[tuple[int, ...]] = tuple(COLOR_IDS[c] for c in COLOR_LUT_HL_16)
+
+# Active color id tables for the trail renderer
+# Chosen once by specialize_color() after terminal capabilities are known,
+# so per-glyph lookups need no color-mode check (256-color until then)
+trail_color_ids: tuple[int, ...] = COLOR_ID_LUT_256
+highlight_color_ids: tuple[int, ...] = COLOR_ID_LUT_HL_256
+
+
+def specialize_color(use_256_color: bool) -> None:
+    """
+    Select the active trail color tables for the given color mode.
+
+    Args:
+        use_256_color: Whether to use 256-color mode (vs 16-color)
+    """
+    global trail_color_ids, highlight_color_ids
+    if use_256_color:
+        trail_color_ids, highlight_color_ids = COLOR_ID_LUT_256, COLOR_ID_LUT_HL_256
+    else:
+        trail_color_ids, highlight_color_ids = COLOR_ID_LUT_16, COLOR_ID_LUT_HL_16
+
+
 def get_color_for_position(position: int, use_256_color: bool = True) -> str:
     """
     Get ANSI color code for a given trail position.
@@ -128,33 +235,8 @@ def get_color_for_position(position: int, use_256_color: bool = True) -> str:
     Returns:
         ANSI color code string
     """
-    if use_256_color:
-        # Map position to gradient index
-        if position == 0:
-            idx = 0
-        elif position == 1:
-            idx = 1
-        elif position <= 3:
-            idx = 2
-        elif position <= 6:
-            idx = 3
-        elif position <= 10:
-            idx = 4
-        else:
-            idx = 5
-
-        color_code = COLOR_GRADIENT_256[idx]
-        return f"\033[38;5;{color_code}m"
-    else:
-        # 16-color mode
-        if position == 0:
-            return COLOR_GRADIENT_16[0]
-        elif position <= 2:
-            return COLOR_GRADIENT_16[1]
-        elif position <= 6:
-            return COLOR_GRADIENT_16[2]
-        else:
-            return COLOR_GRADIENT_16[3]
+    lut = COLOR_LUT_256 if use_256_color else COLOR_LUT_16
+    return lut[min(position, MAX_TRAIL_LENGTH - 1)]
 
 
 def get_highlighted_color(position: int, use_256_color: bool = True) -> str:
@@ -168,6 +250,5 @@ def get_highlighted_color(position: int, use_256_color: bool = True) -> str:
     Returns:
         ANSI color code string (one level brighter than normal)
     """
-    # Make highlighted glyphs one level brighter than normal trail
-    highlight_position = max(0, position - 3)
-    return get_color_for_position(highlight_position, use_256_color)
+    lut = COLOR_LUT_HL_256 if use_256_color else COLOR_LUT_HL_16
+    return lut[min(position, MAX_TRAIL_LENGTH - 1)]
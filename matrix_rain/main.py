@@ -4,10 +4,15 @@ Main application entry point and main loop for Matrix rain effect.
 Handles initialization, main rendering loop, input handling, and graceful shutdown.
 """
 
+import os
+import platform
 import select
+import shutil
 import signal
+import subprocess
 import sys
 import termios
+import threading
 import time
 import tty
 from typing import NoReturn
@@ -28,15 +33,18 @@ class MatrixRain:
     """
 
     __slots__ = ('running', 'renderer', 'column_manager', 'use_256_color',
-                 'old_terminal_settings')
+                 'old_terminal_settings', 'input_thread', 'resize_pending')
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize the Matrix rain application."""
         self.running = False
         self.renderer: renderer.TerminalRenderer | None = None
         self.column_manager: column.ColumnManager | None = None
         self.use_256_color = False
-        self.old_terminal_settings = None
+        self.old_terminal_settings: list | None = None
+        self.input_thread: threading.Thread | None = None
+        # Set by the SIGWINCH handler; the main loop re-reads the size
+        self.resize_pending = False
 
     def setup(self) -> bool:
         """
@@ -55,8 +63,9 @@ class MatrixRain:
             print(f"Please resize your terminal to at least {config.MIN_TERMINAL_WIDTH}x{config.MIN_TERMINAL_HEIGHT}", file=sys.stderr)
             return False
 
-        # Detect 256-color support
+        # Detect 256-color support and fix the color tables for the run
         self.use_256_color = renderer.detect_256_color_support()
+        config.specialize_color(self.use_256_color)
 
         # Initialize character pool
         # Try Unicode first, fallback to ASCII if needed
@@ -69,7 +78,7 @@ class MatrixRain:
             characters.initialize_pool(use_unicode=False)
 
         # Initialize renderer
-        self.renderer = renderer.TerminalRenderer(width, height, self.use_256_color)
+        self.renderer = renderer.TerminalRenderer(width, height)
         self.renderer.initialize_terminal()
 
         # Initialize column manager
@@ -87,22 +96,41 @@ class MatrixRain:
         # Set terminal to raw mode for immediate key detection
         tty.setcbreak(sys.stdin.fileno())
 
-    def check_for_quit(self) -> bool:
+    def check_for_quit(self, timeout: float = 0.0) -> bool:
         """
         Check if user pressed 'q' to quit.
 
+        Args:
+            timeout: Seconds to wait for input (0 = don't block)
+
         Returns:
             True if 'q' was pressed, False otherwise
         """
-        # Use select to check if input is available (non-blocking)
-        if select.select([sys.stdin], [], [], 0)[0]:
+        # Use select to check if input is available
+        if select.select([sys.stdin], [], [], timeout)[0]:
             char = sys.stdin.read(1)
             if char.lower() == 'q':
                 return True
         return False
 
+    def input_loop(self) -> None:
+        """
+        Watch the keyboard for 'q' on a background thread.
+
+        Keeps stdin syscalls off the render loop. Waits with a short timeout
+        so the thread notices shutdown promptly.
+        """
+        while self.running:
+            if self.check_for_quit(config.INPUT_POLL_TIMEOUT):
+                self.running = False
+
     def cleanup(self) -> None:
         """Clean up and restore terminal state."""
+        # Stop the input thread before handing stdin back
+        self.running = False
+        if self.input_thread is not None:
+            self.input_thread.join(config.INPUT_POLL_TIMEOUT * 2)
+
         # Restore terminal settings
         if self.old_terminal_settings is not None:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_terminal_settings)
@@ -121,6 +149,34 @@ class MatrixRain:
         """
         self.running = False
 
+    def handle_resize(self, signum: int, frame) -> None:
+        """
+        Handle terminal resize (SIGWINCH).
+
+        Only invalidates the cached size and flags the resize; the main
+        loop queries the new size and applies it between frames, so no OS
+        query (or tput fork) runs inside the signal handler.
+
+        Args:
+            signum: Signal number
+            frame: Current stack frame
+        """
+        renderer.invalidate_terminal_size()
+        self.resize_pending = True
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Resize renderer and columns to new terminal dimensions.
+
+        Args:
+            width: New terminal width
+            height: New terminal height
+        """
+        if self.renderer:
+            self.renderer.resize(width, height)
+        if self.column_manager:
+            self.column_manager.resize(width, height)
+
     def run(self) -> None:
         """
         Main loop for Matrix rain effect.
@@ -128,8 +184,9 @@ class MatrixRain:
         Research: "Target 20fps refresh rate with 50ms delay between frames"
         Press 'q' or Ctrl+C to exit gracefully.
         """
-        # Set up signal handler for graceful exit
+        # Set up signal handlers for graceful exit and terminal resize
         signal.signal(signal.SIGINT, self.handle_interrupt)
+        signal.signal(signal.SIGWINCH, self.handle_resize)
 
         # Setup
         if not self.setup():
@@ -137,45 +194,50 @@ class MatrixRain:
 
         try:
             self.running = True
-            last_time = time.time()
+            # Frames are scheduled on fixed deadlines (monotonic, integer ns
+            # so long runs don't accumulate float error)
+            next_deadline = time.monotonic_ns() + config.FRAME_DELAY_NS
 
-            while self.running:
-                # Check for 'q' key to quit
-                if self.check_for_quit():
-                    self.running = False
-                    break
+            # Watch for 'q' key to quit
+            self.input_thread = threading.Thread(target=self.input_loop, daemon=True)
+            self.input_thread.start()
 
-                # Calculate delta time
-                current_time = time.time()
-                delta_time = current_time - last_time
-                last_time = current_time
+            while self.running:
+                # Apply a pending terminal resize between frames
+                if self.resize_pending:
+                    # Clear the flag before querying: a SIGWINCH arriving
+                    # after this point just sets it again for next frame
+                    self.resize_pending = False
+                    width, height = renderer.get_terminal_size()
+                    self.resize(width, height)
 
                 # Update column states
+                # Physics is frame-locked: every frame advances exactly one
+                # frame period, keeping motion smooth and reproducible
                 if self.column_manager:
-                    self.column_manager.update(delta_time)
+                    self.column_manager.update(config.FRAME_DELAY)
 
-                # Clear buffer
+                # Draw columns straight into a cleared buffer and render to screen
                 if self.renderer:
                     self.renderer.clear_buffer()
-
-                # Get all render data from columns
-                if self.column_manager:
-                    render_data = self.column_manager.get_all_render_data()
-
-                    # Update renderer buffer
-                    if self.renderer:
-                        for row, col, char, trail_pos, is_highlighted in render_data:
-                            self.renderer.set_character(
-                                row, col, char, trail_pos, is_highlighted
-                            )
-
-                # Render to screen
-                if self.renderer:
+                    if self.column_manager:
+                        self.column_manager.render_into(
+                            self.renderer.chars, self.renderer.colors, self.renderer.row_dirty
+                        )
                     self.renderer.render()
 
                 # Frame rate limiting
                 # Research: "50ms delay between frames (1000ms/20fps)"
-                time.sleep(config.FRAME_DELAY)
+                # Sleep until the next deadline rather than a fixed delay, so
+                # update/render time doesn't stretch the frame period
+                now = time.monotonic_ns()
+                if now - next_deadline > config.FRAME_DELAY_NS:
+                    # More than a frame behind (e.g. process was suspended):
+                    # resync instead of rushing through the backlog
+                    next_deadline = now
+                elif now < next_deadline:
+                    time.sleep((next_deadline - now) / 1_000_000_000)
+                next_deadline += config.FRAME_DELAY_NS
 
         except Exception as e:
             # Ensure cleanup happens even on unexpected errors
@@ -197,5 +259,52 @@ def run() -> None:
     app.run()
 
 
+def run_pypy() -> None:
+    """
+    Entry point that runs the Matrix rain effect under PyPy.
+
+    The column and render loops are plain Python over small arrays, which
+    PyPy's tracing JIT compiles to machine code with no source changes.
+    Re-executes the package with `pypy3` when started from another
+    interpreter, falling back to the current one if PyPy is not installed,
+    is older than Python 3.10, or cannot import the package.
+
+    From a source checkout the checkout is put on PYTHONPATH; an installed
+    copy must also be installed into PyPy itself (`pypy3 -m pip install .`).
+    """
+    if platform.python_implementation() == "PyPy":
+        run()
+        return
+
+    pypy = shutil.which("pypy3")
+    if pypy is None:
+        print("pypy3 not found, running with the current interpreter", file=sys.stderr)
+        run()
+        return
+
+    env = dict(os.environ)
+    # Running from a checkout: make its package importable from PyPy. Only
+    # the checkout goes on the path, never this interpreter's site-packages
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.exists(os.path.join(package_root, "pyproject.toml")):
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    # Distro PyPy builds are often older than the 3.10 this package needs
+    probe = (
+        "import importlib.util, sys; "
+        "sys.exit(sys.version_info < (3, 10) or importlib.util.find_spec('matrix_rain') is None)"
+    )
+    if subprocess.run([pypy, "-c", probe], env=env).returncode != 0:
+        print(
+            "pypy3 is older than Python 3.10 or cannot import matrix_rain, "
+            "running with the current interpreter",
+            file=sys.stderr,
+        )
+        run()
+        return
+
+    os.execve(pypy, [pypy, "-m", "matrix_rain.main"], env)
+
+
 if __name__ == "__main__":
     run()
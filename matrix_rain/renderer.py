@@ -5,11 +5,24 @@ Manages screen buffer, cursor control, and efficient terminal updates.
 """
 
 import os
+import signal
 import sys
+from array import array
 from typing import Final
 
+from . import _hot
 from . import config
 
+# Color id outside the palette, marking prev cells whose terminal contents
+# are unknown so the next render rewrites them
+_STALE_COLOR: Final[int] = 0xFF
+
+# Without SIGWINCH there is no resize notification to invalidate a cache
+_HAS_SIGWINCH: Final[bool] = hasattr(signal, "SIGWINCH")
+
+# Last size returned by get_terminal_size(), None until queried
+_cached_size: tuple[int, int] | None = None
+
 
 class TerminalRenderer:
     """
@@ -20,34 +33,57 @@ class TerminalRenderer:
     - Update only changed positions (dirty tracking)
     - 256-color mode for smooth gradients
 
+    The screen is held struct-of-arrays style: one flat array of glyph ids
+    (indices into config.GLYPH_SET) and one of color ids (indices into
+    config.COLOR_TABLE), cell (row, col) at row * width + col, instead of
+    a (char, color) tuple per cell in nested rows.
+
     Using __slots__ to reduce memory overhead.
     """
 
-    __slots__ = ('width', 'height', 'use_256_color', 'buffer', 'prev_buffer')
+    __slots__ = ('width', 'height', 'chars', 'colors', 'prev_chars',
+                 'prev_colors', 'cursor_moves', 'out', 'row_dirty', '_write',
+                 '_flush', '_fd')
 
-    def __init__(self, width: int, height: int, use_256_color: bool = True):
+    def __init__(self, width: int, height: int):
         """
         Initialize terminal renderer.
 
+        The color mode (256 or 16 colors) is not a renderer setting: it comes
+        from the tables selected by config.specialize_color().
+
         Args:
             width: Terminal width in characters
             height: Terminal height in characters
-            use_256_color: Whether to use 256-color mode
         """
         self.width = width
         self.height = height
-        self.use_256_color = use_256_color
 
-        # Screen buffer: stores (char, color_code) for each position
-        # Initialize with empty spaces
-        self.buffer: list[list[tuple[str, str]]] = [
-            [(" ", "")] * width for _ in range(height)
-        ]
+        # Screen buffers: glyph id and color id for each position
+        # Initialize with empty spaces in the default color
+        self.chars, self.colors = _blank_buffers(width, height)
+
+        # Previous buffers for dirty tracking
+        # Kept as exact copies rather than per-row hashes: the per-cell diff
+        # needs the old cells, and only rows that changed are re-copied
+        self.prev_chars, self.prev_colors = _blank_buffers(width, height)
 
-        # Previous buffer for dirty tracking
-        self.prev_buffer: list[list[tuple[str, str]]] = [
-            [(" ", "")] * width for _ in range(height)
-        ]
+        # Per-row damage flags: rows written since the last render
+        self.row_dirty = bytearray(height)
+
+        # Cursor-position escape for every cell, so render() looks them up
+        # instead of formatting one per move
+        self.cursor_moves = _cursor_move_table(width, height)
+
+        # Frame output buffer, reused across frames
+        self.out = bytearray()
+
+        # Bound once: every write goes as bytes to stdout's binary buffer
+        self._write = sys.stdout.buffer.write
+        self._flush = sys.stdout.buffer.flush
+        # Descriptor frames are written to directly, skipping the copy into
+        # the buffered writer (None when stdout has no real descriptor)
+        self._fd = _stdout_fd()
 
     def initialize_terminal(self) -> None:
         """
@@ -55,15 +91,19 @@ class TerminalRenderer:
 
         Research: "Hide cursor", "Clear screen", "Enter alternate buffer"
         """
+        # Push out any pending text before writing beneath the text layer
+        sys.stdout.flush()
+
+        write = self._write
         # Enter alternate screen buffer (preserves user's terminal content)
-        sys.stdout.write(config.ANSI_ALTERNATE_BUFFER)
+        write(config.ANSI_ALTERNATE_BUFFER)
         # Clear screen
-        sys.stdout.write(config.ANSI_CLEAR_SCREEN)
+        write(config.ANSI_CLEAR_SCREEN)
         # Hide cursor
-        sys.stdout.write(config.ANSI_HIDE_CURSOR)
+        write(config.ANSI_HIDE_CURSOR)
         # Move to home
-        sys.stdout.write(config.ANSI_HOME)
-        sys.stdout.flush()
+        write(config.ANSI_HOME)
+        self._flush()
 
     def restore_terminal(self) -> None:
         """
@@ -71,19 +111,31 @@ class TerminalRenderer:
 
         Called on exit to clean up.
         """
+        write = self._write
         # Show cursor
-        sys.stdout.write(config.ANSI_SHOW_CURSOR)
+        write(config.ANSI_SHOW_CURSOR)
         # Reset colors
-        sys.stdout.write(config.ANSI_RESET)
+        write(config.ANSI_RESET)
         # Exit alternate screen buffer
-        sys.stdout.write(config.ANSI_NORMAL_BUFFER)
-        sys.stdout.flush()
+        write(config.ANSI_NORMAL_BUFFER)
+        self._flush()
 
     def clear_buffer(self) -> None:
         """Clear the screen buffer (fill with spaces)."""
-        # Optimized: Use list comprehension instead of nested loops
-        empty_cell = (" ", "")
-        self.buffer = [[empty_cell] * self.width for _ in range(self.height)]
+        # Blank the preallocated buffers in place row by row; rows that are
+        # already blank are left alone and stay undamaged
+        width = self.width
+        blank = array('B', bytes(width))
+        chars = self.chars
+        colors = self.colors
+        row_dirty = self.row_dirty
+        for row in range(self.height):
+            start = row * width
+            end = start + width
+            if chars[start:end] != blank or colors[start:end] != blank:
+                chars[start:end] = blank
+                colors[start:end] = blank
+                row_dirty[row] = 1
 
     def set_character(
         self, row: int, col: int, char: str, trail_position: int, is_highlighted: bool
@@ -91,20 +143,24 @@ class TerminalRenderer:
         """
         Set a character in the buffer with appropriate color.
 
+        Colors come from the tables selected by config.specialize_color(),
+        the same ones the column drawing kernel uses.
+
         Args:
             row: Row position (0-based)
             col: Column position (0-based)
-            char: Character to display
+            char: Character to display (one of config.GLYPH_SET)
             trail_position: Distance from column head (0 = head)
             is_highlighted: Whether this is a highlighted runner glyph
         """
         if 0 <= row < self.height and 0 <= col < self.width:
-            if is_highlighted:
-                color = config.get_highlighted_color(trail_position, self.use_256_color)
-            else:
-                color = config.get_color_for_position(trail_position, self.use_256_color)
-
-            self.buffer[row][col] = (char, color)
+            # Color id straight from the lookup table, no per-call color resolution;
+            # positions past the table use its last (dimmest) entry
+            lut = config.highlight_color_ids if is_highlighted else config.trail_color_ids
+            cell = row * self.width + col
+            self.chars[cell] = config.GLYPH_IDS[char]
+            self.colors[cell] = lut[min(trail_position, config.MAX_TRAIL_LENGTH - 1)]
+            self.row_dirty[row] = 1
 
     def render(self) -> None:
         """
@@ -112,47 +168,30 @@ class TerminalRenderer:
 
         Research: "Update only changed positions" for efficiency.
         """
-        output = []
-        current_color = ""  # Track current color to avoid redundant resets
-
-        for row in range(self.height):
-            for col in range(self.width):
-                current = self.buffer[row][col]
-                previous = self.prev_buffer[row][col]
-
-                # Only update if changed (dirty tracking)
-                if config.USE_DIRTY_TRACKING and current == previous:
-                    continue
-
-                char, color = current
-
-                # Move cursor to position (1-based indexing for ANSI)
-                output.append(f"\033[{row + 1};{col + 1}H")
-
-                # Only change color if different from current
-                if color != current_color:
-                    if color:
-                        output.append(color)
-                        current_color = color
-                    else:
-                        # Need to reset to default
-                        output.append(config.ANSI_RESET)
-                        current_color = ""
-
-                # Write character
-                output.append(char)
-
-        # Reset color at end if needed
-        if current_color:
-            output.append(config.ANSI_RESET)
-
-        # Write all updates in single operation
-        if output:
-            sys.stdout.write("".join(output))
-            sys.stdout.flush()
-
-        # Update previous buffer (optimized: list comprehension)
-        self.prev_buffer = [row[:] for row in self.buffer]
+        row_dirty = self.row_dirty
+
+        # Nothing written since the last frame: a single C-level scan of
+        # the damage flags decides it
+        if config.USE_DIRTY_TRACKING and 1 not in row_dirty:
+            return
+
+        out = self.out
+        out.clear()
+        _hot.assemble_frame(
+            self.chars, self.colors, self.prev_chars, self.prev_colors, row_dirty,
+            self.width, self.cursor_moves, config.USE_DIRTY_TRACKING, out,
+        )
+        # Every row now matches prev again
+        row_dirty[:] = bytes(self.height)
+
+        # Write all updates as bytes in single operation (no join or
+        # text-layer re-encoding)
+        if out:
+            if self._fd is None:
+                self._write(out)
+                self._flush()
+            else:
+                _write_all(self._fd, out)
 
     def resize(self, new_width: int, new_height: int) -> None:
         """
@@ -166,44 +205,180 @@ class TerminalRenderer:
         self.height = new_height
 
         # Recreate buffers with new dimensions
-        self.buffer = [
-            [(" ", "")] * new_width for _ in range(new_height)
-        ]
-        self.prev_buffer = [
-            [(" ", "")] * new_width for _ in range(new_height)
-        ]
-
-        # Clear and redraw
-        sys.stdout.write(config.ANSI_CLEAR_SCREEN)
-        sys.stdout.write(config.ANSI_HOME)
-        sys.stdout.flush()
+        self.chars, self.colors = _blank_buffers(new_width, new_height)
+
+        # What the terminal shows after a resize is unknown (it may have
+        # truncated or rewrapped the old frame), so prev holds a color id
+        # no cell can have: the next render repaints every cell, blanks
+        # included, which takes the place of a clear screen
+        size = new_width * new_height
+        self.prev_chars = array('B', bytes(size))
+        self.prev_colors = array('B', [_STALE_COLOR]) * size
+        self.row_dirty = bytearray(b"\x01") * new_height
+        self.cursor_moves = _cursor_move_table(new_width, new_height)
+
+
+def _stdout_fd() -> int | None:
+    """
+    Get the file descriptor behind sys.stdout.
+
+    Returns:
+        The descriptor, or None if stdout is not backed by one
+    """
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation is an OSError and ValueError subclass
+        return None
+
+
+def _write_all(fd: int, data: bytearray) -> None:
+    """
+    Write all of `data` to a descriptor, retrying after short writes.
+
+    Args:
+        fd: File descriptor to write to
+        data: Bytes to write
+    """
+    remaining = data
+    written = os.write(fd, remaining)
+    while written < len(remaining):
+        # Rare: copy the unwritten tail rather than hold a memoryview on
+        # the reused frame buffer, which would block resizing it
+        remaining = remaining[written:]
+        written = os.write(fd, remaining)
+
+
+def _blank_buffers(width: int, height: int) -> tuple[array, array]:
+    """
+    Allocate blank screen buffers.
+
+    Args:
+        width: Width in characters
+        height: Height in characters
+
+    Returns:
+        Tuple of (chars, colors): flat (row x width) uint8 glyph ids
+        (all blank) and uint8 color ids (all default color)
+    """
+    size = width * height
+    return array('B', bytes(size)), array('B', bytes(size))
+
+
+def _cursor_move_table(width: int, height: int) -> list[bytes]:
+    """
+    Build the cursor-position escape for every cell.
+
+    Args:
+        width: Width in characters
+        height: Height in characters
+
+    Returns:
+        Encoded ANSI cursor moves (1-based positions), flat (row x width)
+    """
+    return [
+        f"\033[{row + 1};{col + 1}H".encode()
+        for row in range(height)
+        for col in range(width)
+    ]
 
 
 def get_terminal_size() -> tuple[int, int]:
     """
     Get current terminal size.
 
+    The size is cached after the first query and only re-read once
+    invalidate_terminal_size() is called (from the SIGWINCH handler).
+    Platforms without SIGWINCH query every time.
+
     Returns:
         Tuple of (width, height) in characters
 
     Raises:
         RuntimeError: If terminal size cannot be determined
     """
+    global _cached_size
+    if _cached_size is None or not _HAS_SIGWINCH:
+        _cached_size = _query_terminal_size()
+    return _cached_size
+
+
+def invalidate_terminal_size() -> None:
+    """Forget the cached terminal size so the next query re-reads it."""
+    global _cached_size
+    _cached_size = None
+
+
+def _query_terminal_size() -> tuple[int, int]:
+    """
+    Query the terminal size from the OS.
+
+    Returns:
+        Tuple of (width, height) in characters
+    """
     try:
         # Try using os.get_terminal_size (Python 3.3+)
         size = os.get_terminal_size()
         return size.columns, size.lines
     except (AttributeError, OSError):
-        # Fallback: try using tput command
+        pass
+
+    # Fallback: ask the kernel directly through another terminal descriptor
+    winsize = _ioctl_terminal_size()
+    if winsize is not None:
+        return winsize
+
+    # Fallback: try using tput command
+    try:
+        import subprocess
+
+        cols = subprocess.check_output(["tput", "cols"]).decode().strip()
+        lines = subprocess.check_output(["tput", "lines"]).decode().strip()
+        return int(cols), int(lines)
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        # Last resort: return standard size
+        return 80, 24
+
+
+def _ioctl_terminal_size() -> tuple[int, int] | None:
+    """
+    Read the window size with ioctl(TIOCGWINSZ).
+
+    os.get_terminal_size() only asks stdout; this tries stdin, stderr and
+    the controlling terminal, one syscall each instead of spawning tput.
+
+    Returns:
+        Tuple of (width, height) in characters, or None if unavailable
+    """
+    try:
+        import fcntl
+        import struct
+        import termios
+    except ImportError:
+        return None
+    if not hasattr(termios, "TIOCGWINSZ"):
+        return None
+
+    def query(fd: int) -> tuple[int, int] | None:
         try:
-            import subprocess
+            rows, cols, _, _ = struct.unpack("HHHH", fcntl.ioctl(fd, termios.TIOCGWINSZ, bytes(8)))
+        except OSError:
+            return None
+        return (cols, rows) if cols and rows else None
 
-            cols = subprocess.check_output(["tput", "cols"]).decode().strip()
-            lines = subprocess.check_output(["tput", "lines"]).decode().strip()
-            return int(cols), int(lines)
-        except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-            # Last resort: return standard size
-            return 80, 24
+    for fd in (0, 2):
+        size = query(fd)
+        if size is not None:
+            return size
+
+    try:
+        fd = os.open("/dev/tty", os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return query(fd)
+    finally:
+        os.close(fd)
 
 
 def validate_terminal_size(width: int, height: int) -> tuple[bool, str]:
@@ -234,14 +409,6 @@ def detect_256_color_support() -> bool:
         True if 256-color mode is likely supported
     """
     # Check TERM environment variable
-    term = os.environ.get("TERM", "")
-
-    # Common 256-color terminal types
-    color256_terms = [
-        "256color",
-        "xterm-256color",
-        "screen-256color",
-        "tmux-256color",
-    ]
-
-    return any(t in term for t in color256_terms)
+    # Common 256-color terminal types (xterm-256color, screen-256color,
+    # tmux-256color, ...) all contain "256color"
+    return "256color" in os.environ.get("TERM", "")
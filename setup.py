@@ -0,0 +1,58 @@
+"""
+Optional ahead-of-time compilation of the per-frame modules.
+
+Package metadata lives in pyproject.toml. When mypyc is installed at build
+time, _hot.py and renderer.py are compiled to C extensions; otherwise the
+package installs as plain Python, which runs unchanged. A failed type
+check or C build (e.g. no working compiler) falls back to the same.
+
+    pip install mypy
+    pip install --no-build-isolation .
+
+Set MATRIX_RAIN_PURE=1 to skip compilation even when mypyc is available.
+"""
+
+import os
+import sys
+
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, CompileError, ExecError, PlatformError
+
+# Failures of the C toolchain itself (missing compiler, compile or link
+# errors, including warnings promoted by -Werror)
+_BUILD_ERRORS = (CCompilerError, CompileError, ExecError, PlatformError)
+
+
+class OptionalBuildExt(build_ext):
+    """build_ext that installs the package uncompiled when the C build fails."""
+
+    def run(self) -> None:
+        try:
+            super().run()
+        except _BUILD_ERRORS as exc:
+            print(f"Compiling extensions failed ({exc}), installing pure Python", file=sys.stderr)
+            # Drop any extensions that did build: a partial set would mix
+            # compiled modules with a missing shared runtime
+            for ext in self.extensions:
+                path = self.get_ext_fullpath(ext.name)
+                if os.path.exists(path):
+                    os.remove(path)
+            self.extensions = []
+
+
+ext_modules = []
+if not os.environ.get("MATRIX_RAIN_PURE"):
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        pass
+    else:
+        try:
+            ext_modules = mypycify(["matrix_rain/_hot.py", "matrix_rain/renderer.py"])
+        except SystemExit:
+            # mypyc exits on any type-check message; install uncompiled
+            # rather than failing the whole build
+            print("mypyc compilation failed, installing pure Python", file=sys.stderr)
+
+setup(ext_modules=ext_modules, cmdclass={"build_ext": OptionalBuildExt})